@@ -2,18 +2,22 @@
 HTTP/gRPC API endpoints for inference service.
 """
 
+import asyncio
 import base64
+import hashlib
 import logging
 import time
 from typing import List, Optional
 
 import numpy as np
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 from ai_service.inference import InferenceEngine, DetectionResult, BoundingBox
 from ai_service.detection import DetectionLogic, DetectionFilter
+from ai_service.batching import DynamicBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,32 @@ except ImportError:
     CV2_AVAILABLE = False
     logger.warning("OpenCV not available. Install with: pip install opencv-python")
 
+# Try to import orjson (faster JSON serialization)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not available, using stdlib json. Install with: pip install orjson")
+
+# Try to import xxhash (faster image hashing for the preprocess cache)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    logger.warning("xxhash not available, using hashlib. Install with: pip install xxhash")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response serialized with orjson when available."""
+    
+    def render(self, content) -> bytes:
+        """Render content to JSON bytes."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        return super().render(content)
+
 
 class InferenceRequest(BaseModel):
     """Inference request model."""
@@ -87,22 +117,41 @@ def decode_image(image_data: str) -> np.ndarray:
         # Decode base64
         image_bytes = base64.b64decode(image_data)
         
-        # Convert bytes to numpy array (compatible with numpy 2.x)
-        nparr = np.asarray(bytearray(image_bytes), dtype=np.uint8)
-        
-        # Decode image
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            raise ValueError("Failed to decode image")
-        
-        return image
+        return decode_image_bytes(image_bytes)
     
     except Exception as e:
         logger.error("Failed to decode image", exc_info=True, extra={"error": str(e)})
         raise ValueError(f"Failed to decode image: {e}") from e
 
 
+def decode_image_bytes(image_bytes: bytes) -> np.ndarray:
+    """
+    Decode raw encoded image bytes (JPEG/PNG) to numpy array.
+    
+    Args:
+        image_bytes: Encoded image bytes
+    
+    Returns:
+        Image as numpy array (BGR format)
+    
+    Raises:
+        ValueError: If image cannot be decoded
+    """
+    if not CV2_AVAILABLE:
+        raise RuntimeError("OpenCV not available for image decoding")
+    
+    # Wrap the bytes without copying (imdecode only reads the buffer)
+    nparr = np.frombuffer(image_bytes, dtype=np.uint8)
+    
+    # Decode image
+    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    
+    if image is None:
+        raise ValueError("Failed to decode image")
+    
+    return image
+
+
 def encode_image(image: np.ndarray, format: str = "JPEG") -> str:
     """
     Encode numpy array image to base64 string.
@@ -129,10 +178,63 @@ def encode_image(image: np.ndarray, format: str = "JPEG") -> str:
     return base64.b64encode(image_bytes).decode("utf-8")
 
 
+def image_cache_key(image_data) -> int:
+    """
+    Compute a preprocess cache key for encoded image data.
+    
+    Args:
+        image_data: Encoded image bytes or base64 string
+    
+    Returns:
+        64-bit hash of the image data
+    """
+    if isinstance(image_data, str):
+        image_data = image_data.encode("ascii", errors="replace")
+    
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(image_data)
+    return int.from_bytes(hashlib.blake2b(image_data, digest_size=8).digest(), "little")
+
+
+def detection_result_to_dict(result: DetectionResult) -> dict:
+    """
+    Convert detection result to an InferenceResponse-shaped dictionary.
+    
+    Building primitive dicts directly avoids re-validating the response
+    through Pydantic models on every request.
+    
+    Args:
+        result: Detection result
+    
+    Returns:
+        Dictionary matching the InferenceResponse schema
+    """
+    boxes = result.bounding_boxes
+    return {
+        "bounding_boxes": [
+            {
+                "x1": box.x1,
+                "y1": box.y1,
+                "x2": box.x2,
+                "y2": box.y2,
+                "confidence": box.confidence,
+                "class_id": box.class_id,
+                "class_name": box.class_name,
+            }
+            for box in boxes
+        ],
+        "inference_time_ms": result.inference_time_ms,
+        "frame_shape": list(result.frame_shape),
+        "model_input_shape": list(result.model_input_shape),
+        "detection_count": len(boxes),
+    }
+
+
 def setup_inference_endpoints(
     app,
     inference_engine: InferenceEngine,
     detection_logic: DetectionLogic,
+    batcher: Optional[DynamicBatcher] = None,
 ):
     """
     Setup inference API endpoints on FastAPI app.
@@ -141,57 +243,96 @@ def setup_inference_endpoints(
         app: FastAPI application instance
         inference_engine: InferenceEngine instance
         detection_logic: DetectionLogic instance
+        batcher: Optional DynamicBatcher that coalesces single-image requests
     """
-    router = APIRouter(prefix="/api/v1", tags=["inference"])
+    # Responses are returned as prebuilt dicts; response_model is kept for the
+    # OpenAPI schema only
+    # Only hash request images when the engine can make use of the key
+    use_preprocess_cache = getattr(inference_engine, "preprocess_cache", None) is not None
     
-    @router.post("/inference", response_model=InferenceResponse)
-    async def inference_endpoint(request: InferenceRequest):
+    router = APIRouter(
+        prefix="/api/v1",
+        tags=["inference"],
+        default_response_class=FastJSONResponse,
+    )
+    
+    @router.post(
+        "/inference",
+        response_model=InferenceResponse,
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {"schema": InferenceRequest.model_json_schema()},
+                    "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+                    "image/*": {"schema": {"type": "string", "format": "binary"}},
+                },
+            },
+        },
+    )
+    async def inference_endpoint(
+        http_request: Request,
+        confidence_threshold: Optional[float] = Query(None, ge=0.0, le=1.0),
+        enabled_classes: Optional[List[str]] = Query(None),
+    ):
         """
         Perform inference on a single image.
         
+        Accepts either a JSON InferenceRequest with a base64-encoded image, or
+        the raw encoded image bytes with an ``image/*`` or
+        ``application/octet-stream`` content type. For raw bodies, overrides
+        are passed as query parameters.
+        
         Args:
-            request: Inference request with base64-encoded image
+            http_request: Incoming HTTP request
+            confidence_threshold: Confidence threshold override (raw bodies)
+            enabled_classes: Filter by class names (raw bodies)
         
         Returns:
             Inference response with detections
         """
+        content_type = http_request.headers.get("content-type", "")
+        body = await http_request.body()
+        
+        if content_type.startswith(("image/", "application/octet-stream")):
+            image_data = None
+        else:
+            try:
+                request = InferenceRequest.model_validate_json(body)
+            except ValidationError as e:
+                raise RequestValidationError(e.errors())
+            image_data = request.image
+            confidence_threshold = request.confidence_threshold
+            enabled_classes = request.enabled_classes
+        
         try:
             # Decode image
-            frame = decode_image(request.image)
+            if image_data is None:
+                frame = decode_image_bytes(body)
+            else:
+                frame = decode_image(image_data)
+            cache_key = image_cache_key(image_data or body) if use_preprocess_cache else None
             
             # Override confidence threshold if provided
-            if request.confidence_threshold is not None:
-                detection_logic.set_confidence_threshold(request.confidence_threshold)
+            if confidence_threshold is not None:
+                detection_logic.set_confidence_threshold(confidence_threshold)
             
             # Set enabled classes if provided
-            if request.enabled_classes is not None:
-                detection_logic.set_enabled_classes(request.enabled_classes)
+            if enabled_classes is not None:
+                detection_logic.set_enabled_classes(enabled_classes)
             
-            # Perform inference
-            result = inference_engine.infer(frame)
+            # Perform inference (coalesced with concurrent requests if batching)
+            if batcher is not None:
+                result = await batcher.submit(frame, cache_key)
+            else:
+                # Inference is blocking; run it off the event loop
+                result = await asyncio.to_thread(inference_engine.infer, frame, cache_key)
             
             # Apply detection filters
             filtered_result = detection_logic.filter_detections(result)
             
             # Convert to response format
-            return InferenceResponse(
-                bounding_boxes=[
-                    BoundingBoxResponse(
-                        x1=box.x1,
-                        y1=box.y1,
-                        x2=box.x2,
-                        y2=box.y2,
-                        confidence=box.confidence,
-                        class_id=box.class_id,
-                        class_name=box.class_name,
-                    )
-                    for box in filtered_result.bounding_boxes
-                ],
-                inference_time_ms=filtered_result.inference_time_ms,
-                frame_shape=list(filtered_result.frame_shape),
-                model_input_shape=list(filtered_result.model_input_shape),
-                detection_count=len(filtered_result.bounding_boxes),
-            )
+            return FastJSONResponse(detection_result_to_dict(filtered_result))
         
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -220,6 +361,11 @@ def setup_inference_endpoints(
             for image_data in request.images:
                 frame = decode_image(image_data)
                 frames.append(frame)
+            cache_keys = (
+                [image_cache_key(image_data) for image_data in request.images]
+                if use_preprocess_cache
+                else None
+            )
             
             # Override confidence threshold if provided
             if request.confidence_threshold is not None:
@@ -229,8 +375,8 @@ def setup_inference_endpoints(
             if request.enabled_classes is not None:
                 detection_logic.set_enabled_classes(request.enabled_classes)
             
-            # Perform batch inference
-            results = inference_engine.infer_batch(frames)
+            # Perform batch inference (blocking; run it off the event loop)
+            results = await asyncio.to_thread(inference_engine.infer_batch, frames, cache_keys)
             
             # Apply detection filters to each result
             filtered_results = [
@@ -238,37 +384,16 @@ def setup_inference_endpoints(
             ]
             
             # Convert to response format
-            response_results = []
-            for result in filtered_results:
-                response_results.append(
-                    InferenceResponse(
-                        bounding_boxes=[
-                            BoundingBoxResponse(
-                                x1=box.x1,
-                                y1=box.y1,
-                                x2=box.x2,
-                                y2=box.y2,
-                                confidence=box.confidence,
-                                class_id=box.class_id,
-                                class_name=box.class_name,
-                            )
-                            for box in result.bounding_boxes
-                        ],
-                        inference_time_ms=result.inference_time_ms,
-                        frame_shape=list(result.frame_shape),
-                        model_input_shape=list(result.model_input_shape),
-                        detection_count=len(result.bounding_boxes),
-                    )
-                )
+            response_results = [detection_result_to_dict(result) for result in filtered_results]
             
             total_time = (time.time() - start_time) * 1000
             avg_time = total_time / len(frames) if frames else 0.0
             
-            return BatchInferenceResponse(
-                results=response_results,
-                total_inference_time_ms=total_time,
-                average_inference_time_ms=avg_time,
-            )
+            return FastJSONResponse({
+                "results": response_results,
+                "total_inference_time_ms": total_time,
+                "average_inference_time_ms": avg_time,
+            })
         
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -294,38 +419,21 @@ def setup_inference_endpoints(
             file_content = await file.read()
             
             # Decode image
-            # Convert bytes to numpy array (compatible with numpy 2.x)
-            nparr = np.asarray(bytearray(file_content), dtype=np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if frame is None:
+            try:
+                frame = decode_image_bytes(file_content)
+            except ValueError:
                 raise ValueError("Failed to decode uploaded image")
             
-            # Perform inference
-            result = inference_engine.infer(frame)
+            cache_key = image_cache_key(file_content) if use_preprocess_cache else None
+            
+            # Perform inference (blocking; run it off the event loop)
+            result = await asyncio.to_thread(inference_engine.infer, frame, cache_key)
             
             # Apply detection filters
             filtered_result = detection_logic.filter_detections(result)
             
             # Convert to response format
-            return InferenceResponse(
-                bounding_boxes=[
-                    BoundingBoxResponse(
-                        x1=box.x1,
-                        y1=box.y1,
-                        x2=box.x2,
-                        y2=box.y2,
-                        confidence=box.confidence,
-                        class_id=box.class_id,
-                        class_name=box.class_name,
-                    )
-                    for box in filtered_result.bounding_boxes
-                ],
-                inference_time_ms=filtered_result.inference_time_ms,
-                frame_shape=list(filtered_result.frame_shape),
-                model_input_shape=list(filtered_result.model_input_shape),
-                detection_count=len(filtered_result.bounding_boxes),
-            )
+            return FastJSONResponse(detection_result_to_dict(filtered_result))
         
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -344,6 +452,8 @@ def setup_inference_endpoints(
             Dictionary with inference statistics
         """
         stats = inference_engine.get_statistics()
+        if batcher is not None:
+            stats["batching"] = batcher.get_statistics()
         return stats
     
     @router.post("/inference/stats/reset")
@@ -0,0 +1,194 @@
+"""
+Dynamic Request Batching for Inference.
+
+Coalesces concurrent single-frame inference requests into batched calls to the
+inference engine, similar to Triton's dynamic batcher.
+"""
+
+import asyncio
+import logging
+from typing import Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from ai_service.inference import InferenceEngine, DetectionResult
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """
+    Server-side dynamic batcher in front of InferenceEngine.
+    
+    Requests are queued and a background task drains the queue, dispatching up
+    to max_batch_size frames at once. A partially filled batch is dispatched
+    once max_queue_delay_ms has elapsed since its first frame was queued.
+    """
+    
+    def __init__(
+        self,
+        inference_engine: InferenceEngine,
+        max_batch_size: int = 8,
+        max_queue_delay_ms: float = 5.0,
+        max_queue_size: int = 100,
+    ):
+        """
+        Initialize dynamic batcher.
+        
+        Args:
+            inference_engine: InferenceEngine instance
+            max_batch_size: Maximum number of frames per batch
+            max_queue_delay_ms: Maximum time to wait for a batch to fill
+            max_queue_size: Maximum number of queued requests
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        
+        self.inference_engine = inference_engine
+        self.max_batch_size = max_batch_size
+        self.max_queue_delay_ms = max_queue_delay_ms
+        self.max_queue_size = max_queue_size
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        self._batch_count = 0
+        self._frame_count = 0
+    
+    def start(self):
+        """
+        Start the batching task on the running event loop.
+        
+        Must be called from within a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = loop.create_task(self._run(), name="InferenceDynamicBatcher")
+        
+        logger.info(
+            "Dynamic batcher started",
+            extra={
+                "max_batch_size": self.max_batch_size,
+                "max_queue_delay_ms": self.max_queue_delay_ms,
+            },
+        )
+    
+    async def stop(self):
+        """Stop the batching task and fail any pending requests."""
+        if self._task is None:
+            return
+        
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        
+        # Fail requests that never made it into a batch
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Inference batcher stopped"))
+        
+        logger.info("Dynamic batcher stopped")
+    
+    async def submit(
+        self,
+        frame: np.ndarray,
+        cache_key: Optional[Hashable] = None,
+    ) -> DetectionResult:
+        """
+        Queue a frame for batched inference and wait for its result.
+        
+        Args:
+            frame: Input frame as numpy array (BGR format)
+            cache_key: Optional preprocess cache key for the frame
+        
+        Returns:
+            DetectionResult for the frame
+        
+        Raises:
+            RuntimeError: If inference fails
+        """
+        # (Re)start lazily so the task always runs on the caller's event loop
+        if self._task is None or self._task.done() or self._loop is not asyncio.get_running_loop():
+            self.start()
+        
+        future = self._loop.create_future()
+        await self._queue.put((frame, cache_key, future))
+        return await future
+    
+    def get_statistics(self) -> dict:
+        """
+        Get batching statistics.
+        
+        Returns:
+            Dictionary with batching statistics
+        """
+        avg_batch_size = (
+            self._frame_count / self._batch_count
+            if self._batch_count > 0
+            else 0.0
+        )
+        
+        return {
+            "total_batches": self._batch_count,
+            "total_frames": self._frame_count,
+            "average_batch_size": avg_batch_size,
+        }
+    
+    async def _run(self):
+        """Collect queued requests into batches and dispatch them."""
+        while True:
+            batch = [await self._queue.get()]
+            
+            deadline = self._loop.time() + self.max_queue_delay_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            await self._dispatch(batch)
+    
+    async def _dispatch(self, batch: List[Tuple[np.ndarray, Optional[Hashable], asyncio.Future]]):
+        """Run inference for a batch and resolve each request's future."""
+        # Drop requests whose callers have gone away
+        batch = [item for item in batch if not item[2].done()]
+        if not batch:
+            return
+        
+        frames = [frame for frame, _, _ in batch]
+        cache_keys = [cache_key for _, cache_key, _ in batch]
+        
+        try:
+            # Inference is blocking; keep it off the event loop
+            results = await asyncio.to_thread(
+                self.inference_engine.infer_batch, frames, cache_keys
+            )
+        except Exception as e:
+            logger.error(
+                "Batched inference failed",
+                exc_info=True,
+                extra={"error": str(e), "batch_size": len(frames)},
+            )
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self._batch_count += 1
+        self._frame_count += len(frames)
+        
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -42,9 +42,12 @@ class ModelConfig:
 @dataclass
 class InferenceConfig:
     """Inference configuration."""
-    batch_size: int = 1
+    batch_size: int = 1  # Max frames per dynamic batch (1 = batching disabled)
     max_queue_size: int = 100
     timeout: float = 30.0
+    max_queue_delay_ms: float = 5.0  # Max wait for a dynamic batch to fill
+    preprocess_cache_size: int = 8  # Preprocessed frames cached by image hash (0 = disabled)
+    num_infer_requests: int = 4  # Concurrent OpenVINO infer requests (0 = serialize calls)
 
 
 @dataclass
@@ -70,6 +73,18 @@ class Config:
         if not (1 <= self.server.port <= 65535):
             raise ValueError(f"Invalid port: {self.server.port}")
         
+        # Validate batch size
+        if self.inference.batch_size < 1:
+            raise ValueError(f"Invalid batch size: {self.inference.batch_size}")
+        
+        # Validate preprocess cache size
+        if self.inference.preprocess_cache_size < 0:
+            raise ValueError(f"Invalid preprocess cache size: {self.inference.preprocess_cache_size}")
+        
+        # Validate infer request count
+        if self.inference.num_infer_requests < 0:
+            raise ValueError(f"Invalid number of infer requests: {self.inference.num_infer_requests}")
+        
         # Validate confidence threshold
         if not (0.0 <= self.model.confidence_threshold <= 1.0):
             raise ValueError(
@@ -161,6 +176,21 @@ def load_config(config_path: Optional[str] = None) -> Config:
                 os.getenv("AI_MAX_QUEUE_SIZE", ai_config.get("inference", {}).get("max_queue_size", 100))
             ),
             timeout=float(os.getenv("AI_TIMEOUT", ai_config.get("inference", {}).get("timeout", 30.0))),
+            max_queue_delay_ms=float(
+                os.getenv("AI_MAX_QUEUE_DELAY_MS", ai_config.get("inference", {}).get("max_queue_delay_ms", 5.0))
+            ),
+            preprocess_cache_size=int(
+                os.getenv(
+                    "AI_PREPROCESS_CACHE_SIZE",
+                    ai_config.get("inference", {}).get("preprocess_cache_size", 8),
+                )
+            ),
+            num_infer_requests=int(
+                os.getenv(
+                    "AI_NUM_INFER_REQUESTS",
+                    ai_config.get("inference", {}).get("num_infer_requests", 4),
+                )
+            ),
         ),
     )
     
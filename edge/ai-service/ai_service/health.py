@@ -4,6 +4,7 @@ Health check endpoints for Edge AI Service.
 Provides liveness, readiness, and detailed health status endpoints.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, Any
@@ -195,7 +196,8 @@ def setup_health_endpoints(app):
         
         Returns comprehensive health status including component checks.
         """
-        components = check_components()
+        # Component checks probe OpenVINO devices (blocking); run off the event loop
+        components = await asyncio.to_thread(check_components)
         
         # Determine overall status
         overall_status = "healthy"
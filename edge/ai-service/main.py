@@ -23,6 +23,7 @@ from ai_service.openvino_runtime import detect_hardware, create_runtime
 from ai_service.model_loader import ModelLoader
 from ai_service.inference import InferenceEngine
 from ai_service.detection import DetectionLogic
+from ai_service.batching import DynamicBatcher
 from ai_service.api import setup_inference_endpoints
 
 # Global logger (will be initialized in main)
@@ -91,6 +92,8 @@ async def lifespan(app: FastAPI):
             model_loader=model_loader,
             confidence_threshold=config.model.confidence_threshold,
             nms_threshold=config.model.nms_threshold,
+            preprocess_cache_size=config.inference.preprocess_cache_size,
+            num_infer_requests=config.inference.num_infer_requests,
         )
         app.state.inference_engine = inference_engine
         
@@ -98,8 +101,20 @@ async def lifespan(app: FastAPI):
         detection_logic = DetectionLogic()
         app.state.detection_logic = detection_logic
         
+        # Start dynamic batcher if batching is enabled
+        batcher = None
+        if config.inference.batch_size > 1:
+            batcher = DynamicBatcher(
+                inference_engine=inference_engine,
+                max_batch_size=config.inference.batch_size,
+                max_queue_delay_ms=config.inference.max_queue_delay_ms,
+                max_queue_size=config.inference.max_queue_size,
+            )
+            batcher.start()
+            app.state.batcher = batcher
+        
         # Setup inference endpoints
-        setup_inference_endpoints(app, inference_engine, detection_logic)
+        setup_inference_endpoints(app, inference_engine, detection_logic, batcher=batcher)
         
         # Mark service as ready
         set_service_ready(True)
@@ -117,6 +132,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Edge AI Service")
+    
+    batcher = getattr(app.state, "batcher", None)
+    if batcher is not None:
+        await batcher.stop()
     # TODO: Cleanup resources
 
 
@@ -8,6 +8,7 @@ Converts ONNX models to OpenVINO IR format.
 import argparse
 import sys
 from pathlib import Path
+from typing import Optional, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -17,6 +18,27 @@ from ai_service.logger import setup_logging
 from ai_service.config import LogConfig
 
 
+def parse_input_shape(value: str) -> Optional[Tuple[int, ...]]:
+    """
+    Parse a comma-separated input shape such as '1,3,640,640'.
+    
+    Args:
+        value: Shape string from the command line
+    
+    Returns:
+        Shape tuple with 3 or 4 positive dimensions, or None if invalid
+    """
+    try:
+        shape = tuple(int(dim) for dim in value.split(","))
+    except ValueError:
+        return None
+    
+    if len(shape) not in (3, 4) or any(dim <= 0 for dim in shape):
+        return None
+    
+    return shape
+
+
 def main():
     """Main entry point for model conversion."""
     parser = argparse.ArgumentParser(
@@ -62,9 +84,10 @@ def main():
     # Setup logging
     setup_logging(LogConfig(level="INFO", format="text", output="stdout"))
     
-    # Check tools if requested
+    # Check tools once up front so we fail fast before doing any work
+    tools_info = check_openvino_tools()
+    
     if args.check_tools:
-        tools_info = check_openvino_tools()
         print("OpenVINO Tools Status:")
         print(f"  Available: {tools_info['tools_available']}")
         if tools_info.get("version"):
@@ -73,12 +96,16 @@ def main():
             print(f"  Error: {tools_info['error']}")
         return 0 if tools_info["tools_available"] else 1
     
+    if not tools_info["tools_available"]:
+        print(f"❌ OpenVINO tools not available: {tools_info.get('error')}", file=sys.stderr)
+        print("Install with: pip install openvino[tools]", file=sys.stderr)
+        return 1
+    
     # Parse input shape if provided
     input_shape = None
     if args.input_shape:
-        try:
-            input_shape = tuple(map(int, args.input_shape.split(",")))
-        except ValueError:
+        input_shape = parse_input_shape(args.input_shape)
+        if input_shape is None:
             print(f"Error: Invalid input shape format: {args.input_shape}", file=sys.stderr)
             print("Expected format: '1,3,640,640'", file=sys.stderr)
             return 1
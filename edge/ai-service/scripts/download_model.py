@@ -10,6 +10,7 @@ from a remote VM, not locally.
 
 import argparse
 import logging
+import shutil
 import sys
 from pathlib import Path
 
@@ -63,19 +64,20 @@ def download_yolov8_model(model_name: str = "yolov8n", model_dir: Path = None):
     # Export to ONNX first
     onnx_path = model_dir / f"{model_name}.onnx"
     logger.info(f"Exporting to ONNX: {onnx_path}")
-    model.export(format="onnx", imgsz=640, simplify=True)
+    exported = model.export(format="onnx", imgsz=640, simplify=True)
     
-    # Move ONNX file to model directory
-    # YOLO exports to current directory, so we need to find it
-    onnx_files = list(Path(".").glob(f"{model_name}*.onnx"))
-    if onnx_files:
-        import shutil
-        shutil.move(str(onnx_files[0]), str(onnx_path))
-        logger.info(f"ONNX model saved to: {onnx_path}")
-    else:
+    # export() returns the path of the written file, so there is no need to
+    # scan the working directory for it
+    exported_path = Path(exported) if exported else None
+    if exported_path is None or not exported_path.exists():
         logger.error("Failed to find exported ONNX file")
         return False
     
+    # Move ONNX file to model directory
+    if exported_path.resolve() != onnx_path.resolve():
+        shutil.move(str(exported_path), str(onnx_path))
+    logger.info(f"ONNX model saved to: {onnx_path}")
+    
     # Convert ONNX to OpenVINO IR
     logger.info("Converting ONNX to OpenVINO IR...")
     try:
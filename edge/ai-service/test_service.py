@@ -5,29 +5,44 @@ Simple test script to verify the AI service structure.
 This script tests basic functionality without requiring all dependencies.
 """
 
+import logging
 import sys
 from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Import service modules once; each check below only consults the flag
+try:
+    from ai_service.config import Config, LogConfig, load_config
+    from ai_service.logger import setup_logging
+    from ai_service.health import (
+        set_service_ready,
+        is_service_ready,
+        get_uptime_seconds,
+        check_components,
+    )
+    IMPORTS_OK = True
+    IMPORT_ERROR = None
+except ImportError as e:
+    IMPORTS_OK = False
+    IMPORT_ERROR = e
+
 def test_imports():
     """Test that all modules can be imported."""
     print("Testing imports...")
-    try:
-        from ai_service import config, logger, health
-        print("✅ All modules imported successfully")
-        return True
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
+    if not IMPORTS_OK:
+        print(f"❌ Import error: {IMPORT_ERROR}")
         return False
+    print("✅ All modules imported successfully")
+    return True
 
 def test_config():
     """Test configuration loading."""
     print("\nTesting configuration...")
+    if not IMPORTS_OK:
+        return False
     try:
-        from ai_service.config import Config, load_config
-        
         # Test default config
         default_config = Config()
         print(f"✅ Default config created: log level = {default_config.log.level}")
@@ -47,14 +62,12 @@ def test_config():
 def test_logger():
     """Test logging setup."""
     print("\nTesting logger...")
+    if not IMPORTS_OK:
+        return False
     try:
-        from ai_service.logger import setup_logging
-        from ai_service.config import LogConfig
-        
         log_config = LogConfig(level="INFO", format="text", output="stdout")
         setup_logging(log_config)
         
-        import logging
         logger = logging.getLogger("test")
         logger.info("Test log message")
         print("✅ Logger setup successful")
@@ -66,14 +79,9 @@ def test_logger():
 def test_health():
     """Test health check module."""
     print("\nTesting health checks...")
+    if not IMPORTS_OK:
+        return False
     try:
-        from ai_service.health import (
-            set_service_ready,
-            is_service_ready,
-            get_uptime_seconds,
-            check_components,
-        )
-        
         # Test service ready
         set_service_ready(True)
         assert is_service_ready() == True
@@ -20,6 +20,19 @@ from ai_service.inference import InferenceEngine
 from ai_service.detection import DetectionLogic
 from ai_service.openvino_runtime import create_runtime
 
+# All integration tests need a real OpenVINO install; skip the package once
+# at collection time instead of probing the import inside every fixture.
+ov = pytest.importorskip("openvino")
+
+
+@pytest.fixture(scope="session")
+def _openvino_available() -> bool:
+    """Probe OpenVINO availability once per test session."""
+    from ai_service.openvino_runtime import OPENVINO_AVAILABLE
+    if not OPENVINO_AVAILABLE:
+        pytest.skip("OpenVINO not available")
+    return True
+
 
 @pytest.fixture
 def temp_dir() -> Generator[Path, None, None]:
@@ -58,19 +71,8 @@ def integration_config(temp_dir: Path, models_dir: Path) -> Config:
     )
 
 
-@pytest.fixture
-def mock_model_files(models_dir: Path) -> tuple[Path, Path]:
-    """
-    Create mock OpenVINO model files for testing.
-    
-    Returns:
-        Tuple of (xml_path, bin_path)
-    """
-    xml_path = models_dir / "yolov8n.xml"
-    bin_path = models_dir / "yolov8n.bin"
-    
-    # Create minimal valid OpenVINO IR XML file
-    xml_content = """<?xml version="1.0"?>
+# Minimal OpenVINO IR used by the mock model fixtures
+MOCK_MODEL_XML = b"""<?xml version="1.0"?>
 <net name="yolov8n" version="11">
     <layers>
         <layer id="0" name="input" type="Parameter" version="opset1">
@@ -98,10 +100,55 @@ def mock_model_files(models_dir: Path) -> tuple[Path, Path]:
         <edge from-layer="0" from-port="0" to-layer="1" to-port="0"/>
     </edges>
 </net>"""
+
+# Dummy weights (small size for testing)
+MOCK_MODEL_BIN = b"\x00" * 1024  # 1KB dummy file
+
+
+@pytest.fixture(scope="session")
+def mock_model_bytes() -> tuple[bytes, bytes]:
+    """
+    In-memory mock OpenVINO model, shared across the test session.
     
-    xml_path.write_text(xml_content)
-    # Create dummy binary file (small size for testing)
-    bin_path.write_bytes(b"\x00" * 1024)  # 1KB dummy file
+    Returns:
+        Tuple of (xml_bytes, bin_bytes)
+    """
+    return MOCK_MODEL_XML, MOCK_MODEL_BIN
+
+
+@pytest.fixture(scope="session")
+def mock_ov_model(mock_model_bytes, _openvino_available):
+    """
+    Read the mock model straight from memory, without touching the filesystem.
+    
+    The weights are wrapped in a shared-memory tensor so OpenVINO reads them
+    in place.
+    """
+    xml_bytes, bin_bytes = mock_model_bytes
+    weights = ov.Tensor(np.frombuffer(bytearray(bin_bytes), dtype=np.uint8), shared_memory=True)
+    try:
+        return ov.Core().read_model(model=xml_bytes, weights=weights)
+    except Exception as e:
+        pytest.skip(f"Cannot read mock model from memory: {e}")
+
+
+@pytest.fixture
+def mock_model_files(models_dir: Path, mock_model_bytes) -> tuple[Path, Path]:
+    """
+    Create mock OpenVINO model files for testing.
+    
+    Files stay function-scoped because hot-reload tests modify them; the
+    contents come from the session-wide in-memory copy.
+    
+    Returns:
+        Tuple of (xml_path, bin_path)
+    """
+    xml_bytes, bin_bytes = mock_model_bytes
+    xml_path = models_dir / "yolov8n.xml"
+    bin_path = models_dir / "yolov8n.bin"
+    
+    xml_path.write_bytes(xml_bytes)
+    bin_path.write_bytes(bin_bytes)
     
     return xml_path, bin_path
 
@@ -115,7 +162,7 @@ def sample_frame() -> np.ndarray:
 
 
 @pytest.fixture
-def openvino_runtime():
+def openvino_runtime(_openvino_available):
     """Create OpenVINO runtime for testing."""
     runtime = create_runtime(device="CPU")
     if runtime is None:
@@ -126,14 +173,6 @@ def openvino_runtime():
 @pytest.fixture
 def model_loader(models_dir: Path, openvino_runtime, mock_model_files):
     """Create model loader for integration tests."""
-    # Skip if OpenVINO is not available
-    try:
-        from ai_service.openvino_runtime import OPENVINO_AVAILABLE
-        if not OPENVINO_AVAILABLE:
-            pytest.skip("OpenVINO not available")
-    except ImportError:
-        pytest.skip("OpenVINO not available")
-    
     loader = ModelLoader(
         model_dir=models_dir,
         device="CPU",
@@ -166,7 +205,7 @@ def detection_logic():
 
 
 @pytest.fixture
-def app_client(integration_config, temp_dir):
+def app_client(integration_config, temp_dir, _openvino_available):
     """
     Create FastAPI app and test client for integration tests.
     
@@ -176,53 +215,45 @@ def app_client(integration_config, temp_dir):
     app.state.config = integration_config
     
     # Try to initialize runtime and model
+    runtime = create_runtime(device="CPU")
+    if runtime is None:
+        pytest.skip("Cannot create OpenVINO runtime")
+    
+    app.state.runtime = runtime
+    
+    # Try to load model
+    models_dir = Path(integration_config.model.model_dir)
+    if not (models_dir / "yolov8n.xml").exists():
+        pytest.skip("Model files not found for integration tests")
+    
+    model_loader = ModelLoader(
+        model_dir=models_dir,
+        device="CPU",
+        runtime=runtime,
+    )
+    
     try:
-        from ai_service.openvino_runtime import OPENVINO_AVAILABLE, create_runtime
-        if not OPENVINO_AVAILABLE:
-            pytest.skip("OpenVINO not available for integration tests")
+        model_loader.load_model("yolov8n", "openvino")
+        app.state.model_loader = model_loader
         
-        runtime = create_runtime(device="CPU")
-        if runtime is None:
-            pytest.skip("Cannot create OpenVINO runtime")
+        inference_engine = InferenceEngine(
+            model_loader=model_loader,
+            confidence_threshold=0.5,
+            nms_threshold=0.4,
+        )
+        app.state.inference_engine = inference_engine
         
-        app.state.runtime = runtime
+        detection_logic = DetectionLogic()
+        app.state.detection_logic = detection_logic
         
-        # Try to load model
-        models_dir = Path(integration_config.model.model_dir)
-        if not (models_dir / "yolov8n.xml").exists():
-            pytest.skip("Model files not found for integration tests")
+        from ai_service.api import setup_inference_endpoints
+        setup_inference_endpoints(app, inference_engine, detection_logic)
         
-        model_loader = ModelLoader(
-            model_dir=models_dir,
-            device="CPU",
-            runtime=runtime,
-        )
+        from ai_service.health import set_service_ready
+        set_service_ready(True)
         
-        try:
-            model_loader.load_model("yolov8n", "openvino")
-            app.state.model_loader = model_loader
-            
-            inference_engine = InferenceEngine(
-                model_loader=model_loader,
-                confidence_threshold=0.5,
-                nms_threshold=0.4,
-            )
-            app.state.inference_engine = inference_engine
-            
-            detection_logic = DetectionLogic()
-            app.state.detection_logic = detection_logic
-            
-            from ai_service.api import setup_inference_endpoints
-            setup_inference_endpoints(app, inference_engine, detection_logic)
-            
-            from ai_service.health import set_service_ready
-            set_service_ready(True)
-            
-        except Exception as e:
-            pytest.skip(f"Cannot load model for integration tests: {e}")
-    
-    except ImportError:
-        pytest.skip("OpenVINO not available for integration tests")
+    except Exception as e:
+        pytest.skip(f"Cannot load model for integration tests: {e}")
     
     return TestClient(app)
 
@@ -238,6 +269,7 @@ def base64_image(sample_frame) -> str:
     if not success:
         pytest.fail("Failed to encode test image")
     
-    image_bytes = encoded.tobytes()
-    return base64.b64encode(image_bytes).decode("utf-8")
+    # b64encode accepts any buffer, so encode straight from the ndarray
+    # without an intermediate tobytes() copy
+    return base64.b64encode(memoryview(encoded)).decode("ascii")
 
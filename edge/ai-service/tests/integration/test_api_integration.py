@@ -145,6 +145,28 @@ class TestAPIEndpoints:
         data = response.json()
         assert "bounding_boxes" in data
     
+    def test_raw_bytes_inference_endpoint(
+        self,
+        app_client: TestClient,
+        sample_frame,
+    ):
+        """Test inference endpoint with raw JPEG bytes instead of base64 JSON."""
+        import cv2
+        
+        success, encoded = cv2.imencode(".jpg", sample_frame)
+        assert success
+        
+        response = app_client.post(
+            "/api/v1/inference",
+            content=encoded.tobytes(),
+            headers={"Content-Type": "image/jpeg"},
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "bounding_boxes" in data
+        assert data["frame_shape"] == list(sample_frame.shape[:2])
+    
     def test_inference_stats_endpoint(
         self,
         app_client: TestClient,
@@ -3,6 +3,7 @@ Unit tests for inference API endpoints.
 """
 
 import base64
+import json
 import pytest
 import numpy as np
 from unittest.mock import Mock, MagicMock, patch
@@ -15,9 +16,12 @@ from ai_service.api import (
     encode_image,
     InferenceRequest,
     InferenceResponse,
+    FastJSONResponse,
+    detection_result_to_dict,
 )
 from ai_service.inference import InferenceEngine, DetectionResult, BoundingBox
 from ai_service.detection import DetectionLogic
+from ai_service.batching import DynamicBatcher
 
 
 class TestImageEncoding:
@@ -72,6 +76,37 @@ class TestImageEncoding:
             mock_cv2.imencode.assert_called_once()
 
 
+class TestResponseSerialization:
+    """Tests for inference response serialization."""
+    
+    def test_detection_result_to_dict_matches_schema(self):
+        """Test that prebuilt response dicts satisfy InferenceResponse."""
+        result = DetectionResult(
+            bounding_boxes=[BoundingBox(10, 10, 50, 50, 0.9, 0, "person")],
+            inference_time_ms=10.0,
+            frame_shape=(480, 640),
+            model_input_shape=(640, 640),
+        )
+        
+        data = detection_result_to_dict(result)
+        
+        response = InferenceResponse.model_validate(data)
+        assert response.detection_count == 1
+        assert response.frame_shape == [480, 640]
+        assert response.bounding_boxes[0].class_name == "person"
+    
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_fast_json_response_render(self, orjson_available):
+        """Test JSON rendering with and without orjson."""
+        if orjson_available:
+            pytest.importorskip("orjson")
+        
+        with patch("ai_service.api.ORJSON_AVAILABLE", orjson_available):
+            response = FastJSONResponse({"confidence": 0.5, "count": 2})
+        
+        assert json.loads(response.body) == {"confidence": 0.5, "count": 2}
+
+
 class TestInferenceEndpoints:
     """Tests for inference API endpoints."""
     
@@ -191,6 +226,50 @@ class TestInferenceEndpoints:
             assert response.status_code == 200
             mock_detection_logic.set_confidence_threshold.assert_called_with(0.7)
     
+    def test_inference_endpoint_raw_bytes(self, client: TestClient, mock_detection_logic):
+        """Test inference endpoint with a raw image body."""
+        with patch("ai_service.api.cv2") as mock_cv2:
+            mock_cv2.imdecode.return_value = np.zeros((480, 640, 3), dtype=np.uint8)
+            
+            response = client.post(
+                "/api/v1/inference?confidence_threshold=0.6",
+                content=b"dummy image data",
+                headers={"Content-Type": "image/jpeg"},
+            )
+            
+            assert response.status_code == 200
+            assert response.json()["detection_count"] == 1
+            mock_cv2.imdecode.assert_called_once()
+            mock_detection_logic.set_confidence_threshold.assert_called_with(0.6)
+    
+    def test_inference_endpoint_invalid_json(self, client: TestClient):
+        """Test inference endpoint rejects a JSON body without an image."""
+        response = client.post("/api/v1/inference", json={"confidence_threshold": 0.5})
+        
+        assert response.status_code == 422
+    
+    def test_inference_endpoint_with_batcher(
+        self,
+        mock_inference_engine,
+        mock_detection_logic,
+        sample_image_base64,
+    ):
+        """Test inference endpoint routed through the dynamic batcher."""
+        app = FastAPI()
+        batcher = DynamicBatcher(mock_inference_engine, max_batch_size=4, max_queue_delay_ms=1.0)
+        setup_inference_endpoints(app, mock_inference_engine, mock_detection_logic, batcher=batcher)
+        client = TestClient(app)
+        
+        with patch("ai_service.api.decode_image") as mock_decode:
+            mock_decode.return_value = np.zeros((480, 640, 3), dtype=np.uint8)
+            
+            response = client.post("/api/v1/inference", json={"image": sample_image_base64})
+            
+            assert response.status_code == 200
+            assert response.json()["detection_count"] == 1
+            mock_inference_engine.infer_batch.assert_called_once()
+            mock_inference_engine.infer.assert_not_called()
+    
     def test_batch_inference_endpoint(
         self,
         client: TestClient,
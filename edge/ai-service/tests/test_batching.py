@@ -0,0 +1,97 @@
+"""
+Unit tests for dynamic request batching.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from ai_service.batching import DynamicBatcher
+from ai_service.inference import DetectionResult
+
+
+def _make_result(frame: np.ndarray) -> DetectionResult:
+    """Build a DetectionResult tagged with the frame's fill value."""
+    return DetectionResult(
+        bounding_boxes=[],
+        inference_time_ms=float(frame[0, 0, 0]),
+        frame_shape=frame.shape[:2],
+        model_input_shape=(640, 640),
+    )
+
+
+class TestDynamicBatcher:
+    """Tests for DynamicBatcher."""
+    
+    @pytest.fixture
+    def mock_inference_engine(self):
+        """Create mock inference engine that echoes one result per frame."""
+        engine = MagicMock()
+        engine.infer_batch.side_effect = lambda frames, cache_keys=None: [
+            _make_result(f) for f in frames
+        ]
+        return engine
+    
+    def test_invalid_batch_size(self, mock_inference_engine):
+        """Test that a non-positive batch size is rejected."""
+        with pytest.raises(ValueError, match="max_batch_size"):
+            DynamicBatcher(mock_inference_engine, max_batch_size=0)
+    
+    def test_concurrent_requests_are_coalesced(self, mock_inference_engine):
+        """Test that concurrent requests share one batched engine call."""
+        batcher = DynamicBatcher(
+            mock_inference_engine,
+            max_batch_size=4,
+            max_queue_delay_ms=50.0,
+        )
+        frames = [np.full((48, 64, 3), i, dtype=np.uint8) for i in range(4)]
+        
+        async def run():
+            results = await asyncio.gather(*(batcher.submit(f) for f in frames))
+            await batcher.stop()
+            return results
+        
+        results = asyncio.run(run())
+        
+        # Each caller gets the result for its own frame
+        assert [r.inference_time_ms for r in results] == [0.0, 1.0, 2.0, 3.0]
+        assert mock_inference_engine.infer_batch.call_count == 1
+        assert batcher.get_statistics()["average_batch_size"] == 4.0
+    
+    def test_batches_split_at_max_batch_size(self, mock_inference_engine):
+        """Test that batches never exceed max_batch_size."""
+        batcher = DynamicBatcher(
+            mock_inference_engine,
+            max_batch_size=2,
+            max_queue_delay_ms=50.0,
+        )
+        frames = [np.zeros((48, 64, 3), dtype=np.uint8) for _ in range(5)]
+        
+        async def run():
+            results = await asyncio.gather(*(batcher.submit(f) for f in frames))
+            await batcher.stop()
+            return results
+        
+        results = asyncio.run(run())
+        
+        assert len(results) == 5
+        batch_sizes = [len(c.args[0]) for c in mock_inference_engine.infer_batch.call_args_list]
+        assert max(batch_sizes) <= 2
+        assert sum(batch_sizes) == 5
+    
+    def test_engine_error_propagates(self, mock_inference_engine):
+        """Test that an inference error is raised to every waiting caller."""
+        mock_inference_engine.infer_batch.side_effect = RuntimeError("Model not loaded")
+        batcher = DynamicBatcher(mock_inference_engine, max_batch_size=2)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        
+        async def run():
+            try:
+                return await batcher.submit(frame)
+            finally:
+                await batcher.stop()
+        
+        with pytest.raises(RuntimeError, match="Model not loaded"):
+            asyncio.run(run())
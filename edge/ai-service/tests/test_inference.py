@@ -6,10 +6,12 @@ import pytest
 import numpy as np
 from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from ai_service.inference import (
     FramePreprocessor,
     PostProcessor,
+    PreprocessCache,
     InferenceEngine,
     BoundingBox,
     DetectionResult,
@@ -106,7 +108,7 @@ class TestPostProcessor:
     def test_process_output_with_detections(self):
         """Test processing output with detections."""
         with patch("ai_service.inference.CV2_AVAILABLE", True), \
-             patch.object(PostProcessor, "_apply_nms") as mock_nms:
+             patch.object(PostProcessor, "_nms_indices") as mock_nms:
             postprocessor = PostProcessor(confidence_threshold=0.3)
             
             # Create mock output with one detection
@@ -117,7 +119,7 @@ class TestPostProcessor:
             output[0, 0, 3] = 0.2  # height
             output[0, 0, 4] = 0.8  # class 0 confidence (person)
             
-            mock_nms.return_value = []
+            mock_nms.return_value = np.empty(0, dtype=np.intp)
             
             boxes = postprocessor.process_output(
                 output=output,
@@ -129,6 +131,30 @@ class TestPostProcessor:
             # NMS returns empty, so no boxes
             assert len(boxes) == 0
     
+    def test_process_output_channels_first(self):
+        """Test channels-first YOLOv8 output with overlapping detections."""
+        postprocessor = PostProcessor(confidence_threshold=0.3, nms_threshold=0.4)
+        
+        # Shape [1, 84, num_detections] as emitted by exported YOLOv8 models
+        output = np.zeros((1, 84, 8400), dtype=np.float32)
+        output[0, :4, 0] = [0.5, 0.5, 0.2, 0.2]
+        output[0, 4, 0] = 0.9  # person
+        output[0, :4, 1] = [0.51, 0.51, 0.2, 0.2]  # overlaps detection 0
+        output[0, 4, 1] = 0.6
+        output[0, :4, 2] = [0.2, 0.2, 0.1, 0.1]
+        output[0, 6, 2] = 0.8  # car
+        
+        boxes = postprocessor.process_output(
+            output=output,
+            scale=1.0,
+            padding=(0, 0),
+            original_shape=(640, 640),
+        )
+        
+        assert [(b.class_name, round(b.confidence, 2)) for b in boxes] == [("person", 0.9), ("car", 0.8)]
+        assert boxes[0].x1 == pytest.approx(256.0)
+        assert boxes[0].x2 == pytest.approx(384.0)
+    
     def test_apply_nms_simple(self):
         """Test simple NMS application."""
         with patch("ai_service.inference.CV2_AVAILABLE", True):
@@ -145,6 +171,19 @@ class TestPostProcessor:
             # Should keep highest confidence boxes
             assert len(filtered) <= len(boxes)
     
+    def test_simple_nms_matches_opencv(self):
+        """Test that the NumPy NMS fallback keeps the same boxes as OpenCV."""
+        postprocessor = PostProcessor()
+        
+        boxes = [
+            BoundingBox(10, 10, 50, 50, 0.9, 0, "person"),
+            BoundingBox(12, 12, 52, 52, 0.7, 0, "person"),  # Overlapping
+            BoundingBox(100, 100, 150, 150, 0.8, 1, "car"),  # Non-overlapping
+        ]
+        
+        assert postprocessor._simple_nms(boxes) == [boxes[0], boxes[2]]
+        assert postprocessor._apply_nms(boxes) == [boxes[0], boxes[2]]
+    
     def test_calculate_iou(self):
         """Test IoU calculation."""
         postprocessor = PostProcessor()
@@ -174,10 +213,13 @@ class TestInferenceEngine:
         """Create mock compiled model."""
         model = MagicMock()
         
-        # Mock inference result
-        output_tensor = MagicMock()
-        output_tensor.data = np.zeros((1, 84, 8400))  # YOLOv8 output shape
-        model.return_value = {"output": output_tensor}
+        # Mock inference result with one YOLOv8 output per input in the batch
+        def run(inputs):
+            output_tensor = MagicMock()
+            output_tensor.data = np.zeros((inputs[0].shape[0], 84, 8400))
+            return {"output": output_tensor}
+        
+        model.side_effect = run
         
         return model
     
@@ -243,6 +285,64 @@ class TestInferenceEngine:
             assert len(results) == 2
             assert all(isinstance(r, DetectionResult) for r in results)
     
+    def test_infer_batch_single_model_call(self, mock_model_loader, mock_compiled_model):
+        """Test that a dynamic batch dimension runs all frames in one call."""
+        mock_model_loader.get_compiled_model.return_value = mock_compiled_model
+        mock_model_loader.get_current_model.return_value = MagicMock()
+        mock_compiled_model.input.return_value.get_partial_shape.return_value = [
+            MagicMock(is_dynamic=True)
+        ]
+        
+        engine = InferenceEngine(model_loader=mock_model_loader)
+        frames = [np.zeros((480, 640, 3), dtype=np.uint8) for _ in range(3)]
+        
+        results = engine.infer_batch(frames)
+        
+        assert len(results) == 3
+        assert mock_compiled_model.call_count == 1
+        batch = mock_compiled_model.call_args.args[0][0]
+        assert batch.shape == (3, 3, 640, 640)
+        assert engine.get_statistics()["total_inferences"] == 3
+    
+    def test_infer_batch_static_batch_size(self, mock_model_loader, mock_compiled_model):
+        """Test that a static batch of 1 falls back to one call per frame."""
+        mock_model_loader.get_compiled_model.return_value = mock_compiled_model
+        mock_model_loader.get_current_model.return_value = MagicMock()
+        batch_dim = MagicMock(is_dynamic=False)
+        batch_dim.get_length.return_value = 1
+        mock_compiled_model.input.return_value.get_partial_shape.return_value = [batch_dim]
+        
+        engine = InferenceEngine(model_loader=mock_model_loader)
+        frames = [np.zeros((480, 640, 3), dtype=np.uint8) for _ in range(3)]
+        
+        results = engine.infer_batch(frames)
+        
+        assert len(results) == 3
+        assert mock_compiled_model.call_count == 3
+    
+    def test_concurrent_infer_uses_infer_queue(self, mock_model_loader):
+        """Test that concurrent calls on a real compiled model share an infer queue."""
+        ov = pytest.importorskip("openvino")
+        import openvino.opset13 as ops
+        
+        # Tiny dynamic-batch model producing a YOLOv8-shaped output
+        param = ops.parameter([-1, 3, 640, 640], np.float32)
+        pooled = ops.reshape(ops.reduce_mean(param, [2, 3], keep_dims=False), [-1, 3, 1], False)
+        output = ops.tile(pooled, [1, 28, 8400])
+        compiled_model = ov.Core().compile_model(ov.Model([output], [param]), "CPU")
+        mock_model_loader.get_compiled_model.return_value = compiled_model
+        mock_model_loader.get_current_model.return_value = MagicMock()
+        
+        engine = InferenceEngine(model_loader=mock_model_loader, num_infer_requests=2)
+        frames = [np.full((480, 640, 3), i, dtype=np.uint8) for i in range(8)]
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(engine.infer, frames))
+        
+        assert len(results) == 8
+        assert engine._infer_queue is not None
+        assert engine._infer_queue_model is compiled_model
+    
     def test_get_statistics(self, mock_model_loader):
         """Test getting inference statistics."""
         engine = InferenceEngine(model_loader=mock_model_loader)
@@ -266,3 +366,47 @@ class TestInferenceEngine:
         assert engine._inference_count == 0
         assert engine._total_inference_time == 0.0
 
+    
+    def test_preprocess_cache_reuses_frame(self, mock_model_loader, mock_compiled_model):
+        """Test that a repeated cache key skips preprocessing."""
+        mock_model_loader.get_compiled_model.return_value = mock_compiled_model
+        mock_model_loader.get_current_model.return_value = MagicMock()
+        
+        engine = InferenceEngine(model_loader=mock_model_loader, preprocess_cache_size=2)
+        preprocessed = (np.zeros((1, 3, 640, 640), dtype=np.float32), 1.0, (0.0, 0.0))
+        engine.preprocessor.preprocess = MagicMock(return_value=preprocessed)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        
+        engine.infer_batch([frame, frame, frame], cache_keys=[1, 1, 1])
+        
+        assert engine.preprocessor.preprocess.call_count == 1
+        stats = engine.get_statistics()
+        assert stats["preprocess_cache_hits"] == 2
+        assert stats["preprocess_cache_misses"] == 1
+    
+    def test_preprocess_cache_disabled(self, mock_model_loader):
+        """Test that cache keys are ignored when the cache is disabled."""
+        engine = InferenceEngine(model_loader=mock_model_loader)
+        
+        assert engine.preprocess_cache is None
+        assert "preprocess_cache_hits" not in engine.get_statistics()
+
+
+class TestPreprocessCache:
+    """Tests for PreprocessCache."""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = PreprocessCache(maxsize=2)
+        entry = (np.zeros(1, dtype=np.float32), 1.0, (0.0, 0.0))
+        
+        cache.put("a", entry)
+        cache.put("b", entry)
+        assert cache.get("a") is entry
+        cache.put("c", entry)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is entry
+        assert cache.get("c") is entry
+        assert cache.hits == 3
+        assert cache.misses == 1